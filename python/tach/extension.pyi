@@ -181,7 +181,7 @@ class ProjectConfig:
 
 class TachPytestPluginHandler:
     removed_test_paths: set[str]
-    all_affected_modules: set[str]
+    all_affected_modules: set[Path]
     num_removed_items: int
     tests_ran_to_completion: bool
     def __new__(
@@ -189,10 +189,10 @@ class TachPytestPluginHandler:
         project_root: Path,
         project_config: ProjectConfig,
         changed_files: list[Path],
-        all_affected_modules: set[Path],
+        all_affected_modules: set[str] | frozenset[str],
     ) -> TachPytestPluginHandler: ...
     def remove_test_path(self, path: Path) -> None: ...
-    def should_remove_items(self, file_path: Path) -> bool: ...
+    def should_remove_items(self, file_path: Path | str) -> bool: ...
 
 class Direction(Enum):
     Dependencies = 0
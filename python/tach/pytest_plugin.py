@@ -1,39 +1,64 @@
 from __future__ import annotations
 
+import base64
+import json
+import os
 import subprocess
+import sys
+import zlib
 from dataclasses import dataclass
+from functools import cache
 from pathlib import Path
 from typing import TYPE_CHECKING, cast
 
 import pytest
 from pytest import Cache, Collector, Config, ExitCode, Item, Session, StashKey
-from rich.console import Console
 
 if TYPE_CHECKING:
     from collections.abc import Generator
 
     from _pytest.reports import TestReport
     from _pytest.terminal import TerminalReporter
+    from rich.console import Console
 
-from tach import filesystem as fs
+# Needed at runtime for the TachPluginState dataclass; importing the compiled
+# extension itself is cheap, unlike config parsing.
 from tach.extension import TachPytestPluginHandler
-from tach.filesystem.git_ops import get_changed_files
-from tach.parsing import parse_project_config
 
 TACH_DURATIONS_CACHE_KEY = "tach/durations"
+TACH_DURATIONS_CACHE_VERSION = 2
+"""Version of the duration cache payload. Unversioned payloads are the legacy flat format."""
+TACH_DURATIONS_MAX_FILES = 10_000
+"""Upper bound on test files with cached durations, so the cache can't grow without limit."""
 
-# Rich console for colored output. force_terminal=True ensures ANSI codes are
-# always generated even when captured. This is needed because pytest_report_collectionfinish
-# requires returning strings (can't print directly), so we capture styled output
-# and return it for pytest to display. soft_wrap=True prevents Rich from inserting
-# hard line breaks in long paths.
-_console = Console(highlight=False, force_terminal=True, soft_wrap=True)
 
+@cache
+def _get_console() -> Console:
+    """Rich console for colored output, created on first use.
 
+    force_terminal=True ensures ANSI codes are always generated even when captured.
+    This is needed because pytest_report_collectionfinish requires returning strings
+    (can't print directly), so we capture styled output and return it for pytest to
+    display. soft_wrap=True prevents Rich from inserting hard line breaks in long paths.
+    """
+    # Local import because rich is only needed once there is output to format,
+    # and this module is loaded for every pytest session
+    from rich.console import Console
+
+    return Console(highlight=False, force_terminal=True, soft_wrap=True)
+
+
+@cache
 def _styled(text: str, style: str) -> str:
-    """Return text with ANSI styling using rich."""
-    with _console.capture() as capture:
-        _console.print(text, style=style, end="")
+    """Return text with ANSI styling using rich.
+
+    Styling is deterministic and only ever applied to a small vocabulary of
+    labels (paths use the raw codes from _dim_codes), so results are memoized to
+    avoid repeated console captures.
+    """
+    console = _get_console()
+    with console.capture() as capture:
+        console.print(text, style=style, end="")
     return capture.get()
 
 
@@ -57,6 +82,95 @@ def _dim(text: str) -> str:
     return _styled(text, "dim")
 
 
+def _dim_codes() -> tuple[str, str]:
+    """Return the escape codes that open and close dim styling.
+
+    Paths are wrapped in these raw codes rather than styled individually, so that
+    listing N paths doesn't round-trip through the rich console N times. This also
+    keeps rich markup (e.g. "[...]") from being interpreted inside file names.
+    """
+    dim_open, dim_close = _dim("\0").split("\0")
+    return dim_open, dim_close
+
+
+# Memoized path resolution. Resolving hits the filesystem (stat/realpath) on
+# every call, and pytest_collect_file runs once per collected file. Resolved
+# paths are kept as plain strings, which is what the plugin compares and stores.
+_resolved_str_cache: dict[Path, str] = {}
+
+
+def _cached_resolve_str(path: Path) -> str:
+    """Return the resolved absolute path as a string, caching the result."""
+    resolved_str = _resolved_str_cache.get(path)
+    if resolved_str is None:
+        resolved_str = os.path.realpath(path)
+        _resolved_str_cache[path] = resolved_str
+    return resolved_str
+
+
+_ORIGIN_HEAD_REF = "refs/remotes/origin/HEAD"
+_DEFAULT_BRANCH_CANDIDATES = ("main", "master")
+"""Local branch names to fall back on, in order of preference."""
+
+
+def _run_git(project_root: Path, *args: str) -> subprocess.CompletedProcess[bytes]:
+    """Run a read-only git command without prompting or taking optional locks.
+
+    stderr is discarded and stdout is left as raw bytes for the caller to decode.
+    """
+    return subprocess.run(
+        ["git", *args],
+        cwd=project_root,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env={**os.environ, "GIT_OPTIONAL_LOCKS": "0"},
+        timeout=2,
+    )
+
+
+def _find_git_common_dir(project_root: Path) -> Path | None:
+    """Locate the git directory holding shared refs for the repo containing project_root.
+
+    Handles worktrees and submodules, where `.git` is a file pointing at the real
+    git directory (and worktrees keep shared refs in its `commondir`).
+    """
+    for directory in (project_root, *project_root.parents):
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            content = dot_git.read_text().strip()
+            if not content.startswith("gitdir:"):
+                return None
+            git_dir = directory / content.removeprefix("gitdir:").strip()
+            commondir_file = git_dir / "commondir"
+            if commondir_file.is_file():
+                return git_dir / commondir_file.read_text().strip()
+            return git_dir
+    return None
+
+
+def _read_origin_head(project_root: Path) -> str | None:
+    """Read the remote default branch straight from the origin/HEAD symref file.
+
+    Symbolic refs are never packed, so when origin/HEAD is set it is a loose file
+    containing e.g. "ref: refs/remotes/origin/main". Returns None when it can't
+    be read this way, leaving detection to git itself.
+    """
+    try:
+        git_dir = _find_git_common_dir(project_root)
+        if git_dir is None:
+            return None
+        content = (git_dir / _ORIGIN_HEAD_REF).read_text().strip()
+    except OSError:
+        return None
+    if not content.startswith("ref: refs/remotes/origin/"):
+        return None
+    return content.removeprefix("ref: refs/remotes/origin/")
+
+
+@cache
 def _get_default_branch(project_root: Path) -> str:
     """Detect the default branch (main/master) for the repository.
 
@@ -64,45 +178,60 @@ def _get_default_branch(project_root: Path) -> str:
     1. Remote HEAD is most reliable but requires remote to be configured
     2. Local branch check works offline but may be ambiguous if both exist
     3. Falls back to "main" as sensible default for new repos
+
+    Method 1 first reads the symref file directly; otherwise methods 1 and 2
+    share a single `git for-each-ref` call. The result is cached per project
+    root, so repeated calls within the same process don't spawn any further
+    git subprocesses.
     """
-    # Method 1: Check remote HEAD symref (most reliable when remote exists)
-    # This tells us what branch the remote considers its default
+    # Method 1 fast path: read the remote HEAD symref without spawning git
+    remote_head = _read_origin_head(project_root)
+    if remote_head:
+        return remote_head
+
+    # List the remote HEAD symref and the candidate local branches in one go.
+    # Each output line is "<refname> <symref target, if any>".
+    refs: dict[str, str] = {}
     try:
-        result = subprocess.run(
-            ["git", "symbolic-ref", "refs/remotes/origin/HEAD"],
-            cwd=project_root,
-            capture_output=True,
-            text=True,
+        result = _run_git(
+            project_root,
+            "for-each-ref",
+            "--format=%(refname) %(symref:short)",
+            _ORIGIN_HEAD_REF,
+            *(f"refs/heads/{branch}" for branch in _DEFAULT_BRANCH_CANDIDATES),
         )
         if result.returncode == 0:
-            # Returns something like "refs/remotes/origin/main"
-            return result.stdout.strip().split("/")[-1]
+            for line in result.stdout.decode(errors="replace").splitlines():
+                refname, _, target = line.partition(" ")
+                refs[refname] = target
     except Exception:
         pass
 
+    # Method 1: Check remote HEAD symref (most reliable when remote exists)
+    # This tells us what branch the remote considers its default
+    remote_head = refs.get(_ORIGIN_HEAD_REF)
+    if remote_head:
+        # Target is something like "origin/main"
+        return remote_head.removeprefix("origin/")
+
     # Method 2: Check which common branch names exist locally
     # Prefer "main" over "master" when both exist (modern convention)
-    existing_branches: list[str] = []
-    for branch in ["main", "master"]:
-        try:
-            result = subprocess.run(
-                ["git", "rev-parse", "--verify", branch],
-                cwd=project_root,
-                capture_output=True,
-            )
-            if result.returncode == 0:
-                existing_branches.append(branch)
-        except Exception:
-            pass
-
-    if existing_branches:
-        # If both exist, prefer "main" (it's first in our check order)
-        return existing_branches[0]
+    for branch in _DEFAULT_BRANCH_CANDIDATES:
+        if f"refs/heads/{branch}" in refs:
+            return branch
 
     # Method 3: Ultimate fallback for repos without standard branch names
     return "main"
 
 
+def _reset_caches() -> None:  # pyright: ignore[reportUnusedFunction]
+    """Clear the module-level caches, as if the plugin were freshly imported."""
+    _get_console.cache_clear()
+    _styled.cache_clear()
+    _get_default_branch.cache_clear()
+    _resolved_str_cache.clear()
+
+
 @dataclass
 class TachPluginState:
     """State for the tach pytest plugin, stored in pytest's stash."""
@@ -113,23 +242,33 @@ class TachPluginState:
     verbose: bool
     base: str
     head: str | None
-    would_skip_paths: set[Path]
+    would_skip_paths: set[str]
+    """Resolved paths of test files that are unaffected by the changes."""
+    all_affected_modules: frozenset[str]
+    """Resolved paths of changed files.
+
+    Kept on the Python side because reading `handler.all_affected_modules`
+    copies the whole set out of the extension on every access.
+    """
+    sorted_affected_modules: list[str]
+    """Resolved paths of changed files, sorted once for display."""
 
 
 tach_state_key: StashKey[TachPluginState] = StashKey()
 """StashKey for storing plugin state on pytest Config."""
 
+_durations_key: StashKey[dict[str, dict[str, float]]] = StashKey()
+"""StashKey for the decoded duration cache, so it is read from disk at most once per session."""
+
 
 def _format_duration(seconds: float) -> str:
     """Format duration in human-readable format."""
     if seconds < 60:
         return f"{seconds:.1f}s"
-    minutes = int(seconds // 60)
-    secs = seconds % 60
+    minutes, secs = divmod(seconds, 60)
     if minutes < 60:
-        return f"{minutes}m {secs:.0f}s"
-    hours = minutes // 60
-    mins = minutes % 60
+        return f"{int(minutes)}m {secs:.0f}s"
+    hours, mins = divmod(int(minutes), 60)
     return f"{hours}h {mins}m"
 
 
@@ -141,52 +280,141 @@ def _get_pytest_cache(config: Config) -> Cache | None:
     return getattr(config, "cache", None)
 
 
-def _get_cached_durations(config: Config) -> dict[str, float]:
-    """Get cached test durations from pytest cache."""
+def _nodeid_file_part(nodeid: str) -> str | None:
+    """Return the rootdir-relative test file part of a nodeid, if any."""
+    # nodeids are like "test_file.py::test_name" or "test_file.py::TestClass::test_name"
+    # relative to the rootdir. Extract the file path (before ::)
+    if "::" not in nodeid:
+        return None
+    return nodeid.split("::", 1)[0]
+
+
+def _nodeid_file_path(config: Config, nodeid: str) -> str | None:
+    """Return the resolved path of the test file a nodeid belongs to, if any."""
+    file_part = _nodeid_file_part(nodeid)
+    if file_part is None:
+        return None
+    # Resolve to absolute path for comparison
+    return _cached_resolve_str(config.rootpath / file_part)
+
+
+def _get_cached_durations(config: Config) -> dict[str, dict[str, float]]:
+    """Get cached test durations from pytest cache.
+
+    Durations are grouped by the test file part of their nodeid,
+    i.e. {file_part: {nodeid: duration}}, so that estimating the duration of
+    skipped files only needs to look at those files. File parts are relative
+    to the rootdir, like nodeids, so the cache stays valid if the checkout
+    moves (e.g. CI workspaces restoring .pytest_cache).
+    """
+    durations = config.stash.get(_durations_key, None)
+    if durations is None:
+        durations = _load_cached_durations(config)
+        config.stash[_durations_key] = durations
+    return durations
+
+
+def _load_cached_durations(config: Config) -> dict[str, dict[str, float]]:
+    """Read and decode test durations from pytest cache."""
     cache = _get_pytest_cache(config)
-    if cache is not None:
-        cached = cast(
-            "dict[str, float] | None",
-            cache.get(TACH_DURATIONS_CACHE_KEY, None),  # pyright: ignore[reportUnknownMemberType]
-        )
-        if cached is not None:
-            return cached
-    return {}
+    if cache is None:
+        return {}
+    cached = cast(
+        "dict[str, object] | None",
+        cache.get(TACH_DURATIONS_CACHE_KEY, None),  # pyright: ignore[reportUnknownMemberType]
+    )
+    if cached is None:
+        return {}
+    if cached.get("version") == TACH_DURATIONS_CACHE_VERSION:
+        try:
+            blob = zlib.decompress(base64.b64decode(cast("str", cached["data"])))
+            return _durations_from_columns(cast("dict[str, object]", json.loads(blob)))
+        except (KeyError, TypeError, ValueError, zlib.error):
+            # Corrupt, truncated or malformed payload; start over rather than
+            # fail the run
+            return {}
+    # Older versions stored a flat {nodeid: duration} mapping
+    return _group_durations_by_file(
+        {
+            nodeid: duration
+            for nodeid, duration in cached.items()
+            if isinstance(duration, (int, float))
+        },
+    )
 
 
-def _save_durations(config: Config, durations: dict[str, float]) -> None:
-    """Save test durations to pytest cache."""
+def _durations_from_columns(cached: dict[str, object]) -> dict[str, dict[str, float]]:
+    """Rebuild grouped durations from the columnar cache payload."""
+    paths = cast("list[str]", cached["paths"])
+    nodeids = cast("list[list[str]]", cached["nodeids"])
+    durations = cast("list[list[float]]", cached["durations"])
+    return {
+        path: dict(zip(file_nodeids, file_durations))
+        for path, file_nodeids, file_durations in zip(paths, nodeids, durations)
+    }
+
+
+def _group_durations_by_file(
+    durations: dict[str, float],
+) -> dict[str, dict[str, float]]:
+    """Group a flat {nodeid: duration} mapping by the nodeid's test file part."""
+    grouped: dict[str, dict[str, float]] = {}
+    for nodeid, duration in durations.items():
+        file_part = _nodeid_file_part(nodeid)
+        if file_part is not None:
+            grouped.setdefault(file_part, {})[nodeid] = duration
+    return grouped
+
+
+def _save_durations(config: Config, durations: dict[str, dict[str, float]]) -> None:
+    """Save test durations to pytest cache.
+
+    The payload is stored column-wise (parallel lists of paths, nodeids and
+    durations) rather than as nested objects, then compactly encoded and
+    zlib-compressed. pytest's cache writes indented JSON, so storing the
+    columns as one base64 string keeps the file small and fast to parse.
+    """
+    config.stash[_durations_key] = durations
     cache = _get_pytest_cache(config)
     if cache is not None:
-        cache.set(TACH_DURATIONS_CACHE_KEY, durations)
+        columns = {
+            "paths": list(durations),
+            "nodeids": [list(file_durations) for file_durations in durations.values()],
+            "durations": [
+                list(file_durations.values()) for file_durations in durations.values()
+            ],
+        }
+        encoded = json.dumps(columns, separators=(",", ":")).encode("utf-8")
+        cache.set(
+            TACH_DURATIONS_CACHE_KEY,
+            {
+                "version": TACH_DURATIONS_CACHE_VERSION,
+                "data": base64.b64encode(zlib.compress(encoded)).decode("ascii"),
+            },
+        )
 
 
-def _estimate_skipped_duration(
-    config: Config, skipped_paths: set[Path]
-) -> float | None:
+def _estimate_skipped_duration(config: Config, skipped_paths: set[str]) -> float | None:
     """Estimate total duration of skipped tests based on cached durations."""
-    if not skipped_paths:
+    if not skipped_paths or _get_pytest_cache(config) is None:
         return None
 
     cached_durations = _get_cached_durations(config)
     if not cached_durations:
         return None
 
+    # Skipped paths are resolved; map them back to rootdir-relative file parts
+    rootdir = _cached_resolve_str(config.rootpath)
     total_duration = 0.0
-    resolved_skipped = {str(p.resolve()) for p in skipped_paths}
-
-    for nodeid, duration in cached_durations.items():
-        # nodeids are like "test_file.py::test_name" or "test_file.py::TestClass::test_name"
-        # Extract the file path (before ::)
-        if "::" in nodeid:
-            file_part = nodeid.split("::")[0]
-            # Resolve to absolute path for comparison
-            try:
-                abs_path = str(Path(file_part).resolve())
-                if abs_path in resolved_skipped:
-                    total_duration += duration
-            except Exception:
-                pass
+    for path in skipped_paths:
+        try:
+            file_part = os.path.relpath(path, rootdir).replace(os.sep, "/")
+        except ValueError:
+            # On Windows, a path on another drive has no relative form
+            continue
+        file_durations = cached_durations.get(file_part)
+        if file_durations:
+            total_duration += sum(file_durations.values())
 
     return total_duration if total_duration > 0 else None
 
@@ -217,12 +445,29 @@ def pytest_addoption(parser: pytest.Parser):
     )
 
 
+def _unregister_plugin(config: Config) -> None:
+    """Remove this plugin from pytest so its remaining hooks are never dispatched.
+
+    Used when the plugin has nothing to do for the session, so that e.g. the
+    pytest_collect_file wrapper doesn't cost a call per collected file.
+    """
+    _ = config.pluginmanager.unregister(sys.modules[__name__])
+
+
 @pytest.hookimpl(tryfirst=True)
 def pytest_configure(config: Config):
+    # Local imports because this module is loaded for every pytest session
+    # (including `pytest --help`), and config parsing and git helpers are
+    # only worthwhile once we actually configure the plugin.
+    from tach import filesystem as fs
+    from tach.filesystem.git_ops import get_changed_files
+    from tach.parsing import parse_project_config
+
     project_root = fs.find_project_config_root() or Path.cwd()
     project_config = parse_project_config(root=project_root)
     if project_config is None:
         # No tach config found, silently disable
+        _unregister_plugin(config)
         return
 
     tach_flag = cast("bool", config.getoption("--tach"))
@@ -233,11 +478,12 @@ def pytest_configure(config: Config):
     # Skipping is enabled if --tach, --tach-base, or --tach-head is provided
     skip_enabled = tach_flag or tach_base_option is not None or bool(head)
 
-    # Use explicit base if provided, otherwise auto-detect
+    # Use explicit base if provided, then the environment override (read on
+    # every configure, unlike the cached detection), otherwise auto-detect
     base = (
         tach_base_option
         if tach_base_option is not None
-        else _get_default_branch(project_root)
+        else os.environ.get("TACH_DEFAULT_BRANCH") or _get_default_branch(project_root)
     )
 
     try:
@@ -256,13 +502,19 @@ def pytest_configure(config: Config):
                 "The base branch may not exist in this checkout. "
                 f"In CI, try: git fetch origin {base}:{base}"
             )
+        _unregister_plugin(config)
         return
 
+    # Keyed by resolved absolute path strings, so that pytest_collect_file
+    # can test membership with a cached string and no per-file Path work.
+    # get_changed_files already returns unique, resolved paths, so this is
+    # only a conversion to strings and needs no further filesystem access.
+    all_affected_modules = frozenset(map(os.fspath, changed_files))
     handler = TachPytestPluginHandler(
         project_root=project_root,
         project_config=project_config,
         changed_files=changed_files,
-        all_affected_modules={changed_file.resolve() for changed_file in changed_files},
+        all_affected_modules=all_affected_modules,
     )
 
     # Store state in pytest's stash (the proper way to store plugin state)
@@ -273,32 +525,21 @@ def pytest_configure(config: Config):
         base=base,
         head=head,
         would_skip_paths=set(),
+        all_affected_modules=all_affected_modules,
+        sorted_affected_modules=sorted(all_affected_modules),
     )
 
 
-def _count_items(collector: Collector) -> int:
-    """Recursively count test items from a collector."""
-    count = 0
-    for item in collector.collect():
-        if isinstance(item, Collector):
-            # It's a collector (e.g., Class), recurse
-            count += _count_items(item)
-        else:
-            # It's a test item
-            count += 1
-    return count
-
-
 @pytest.hookimpl(wrapper=True)
 def pytest_collect_file(
     file_path: Path, parent: Collector
 ) -> Generator[None, list[Collector], list[Collector]]:
     # Check if plugin is active
-    if tach_state_key not in parent.config.stash:
+    state = parent.config.stash.get(tach_state_key, None)
+    if state is None:
         result = yield
         return result
 
-    state = parent.config.stash[tach_state_key]
     handler = state.handler
 
     # Skip any paths that already get filtered out by other hook impls
@@ -306,16 +547,16 @@ def pytest_collect_file(
     if not result:
         return result
 
-    resolved_path = file_path.resolve()
+    resolved_str = _cached_resolve_str(file_path)
 
     # If this test file was changed, keep it
-    if str(resolved_path) in handler.all_affected_modules:
+    if resolved_str in state.all_affected_modules:
         return result
 
     # Check if file should be removed based on its imports
-    if handler.should_remove_items(file_path=resolved_path):
+    if handler.should_remove_items(file_path=resolved_str):
         handler.remove_test_path(file_path)
-        state.would_skip_paths.add(file_path)
+        state.would_skip_paths.add(resolved_str)
 
     return result
 
@@ -324,15 +565,21 @@ def pytest_collection_modifyitems(config: Config, items: list[Item]):
     state = config.stash.get(tach_state_key, None)
     if state is None:
         return
-    items_to_remove = [
-        item for item in items if state.handler.should_remove_items(file_path=item.path)
-    ]
+    # pytest_collect_file already decided which test files are unaffected, so
+    # partition items by their file instead of re-analyzing imports per item.
+    would_skip_paths = state.would_skip_paths
+    items_to_keep: list[Item] = []
+    items_to_remove: list[Item] = []
+    for item in items:
+        if _cached_resolve_str(item.path) in would_skip_paths:
+            items_to_remove.append(item)
+        else:
+            items_to_keep.append(item)
     state.handler.num_removed_items = len(items_to_remove)
 
     # Only skip if --tach or --tach-base was provided
-    if state.skip_enabled:
-        for item in items_to_remove:
-            items.remove(item)
+    if state.skip_enabled and items_to_remove:
+        items[:] = items_to_keep
         config.hook.pytest_deselected(items=items_to_remove)
 
 
@@ -356,46 +603,58 @@ def pytest_report_collectionfinish(
 
     With --tach-verbose, also shows changed files and would-skip paths.
     """
-    if tach_state_key not in config.stash:
+    state = config.stash.get(tach_state_key, None)
+    if state is None:
         return []
 
-    state = config.stash[tach_state_key]
     handler = state.handler
 
-    num_files = len(handler.removed_test_paths)
     num_tests = handler.num_removed_items
 
+    # Bail out before touching the duration cache or formatting anything
     if num_tests == 0:
         return []
 
+    # Each access to this property copies the set out of the extension
+    removed_test_paths = handler.removed_test_paths
+    num_files = len(removed_test_paths)
+
+    # Styled fragments reused on every output line
     prefix = _cyan("[Tach]")
+    dim_open, dim_close = _dim_codes()
+    changed_files = state.sorted_affected_modules
     estimated_duration = _estimate_skipped_duration(config, state.would_skip_paths)
 
+    # Output is built line by line and returned as-is, since pytest takes a
+    # list of lines
+    lines: list[str] = []
+
     # Format helpers
-    def _format_paths(
+    def _add_paths(
         paths: set[str] | set[Path], marker: str, max_shown: int = 5
-    ) -> str:
+    ) -> None:
         path_list = list(paths)
         show_all = state.verbose or len(path_list) <= max_shown
-        lines = [
-            f"{prefix}   {marker} {_dim(str(p))}"
+        lines.extend(
+            f"{prefix}   {marker} {dim_open}{p}{dim_close}"
             for p in (path_list if show_all else path_list[:max_shown])
-        ]
+        )
         if not show_all:
             remaining = len(path_list) - max_shown
             lines.append(f"{prefix}   {_dim(f'... and {remaining} more')}")
-        return "\n".join(lines)
-
-    def _format_changed() -> str:
-        if not handler.all_affected_modules:
-            return ""
-        num = len(handler.all_affected_modules)
-        header = f"{prefix} {num} {_pluralize('file', num)} changed:"
-        lines = [
-            f"{prefix}   {_green('+')} {_dim(str(p))}"
-            for p in sorted(handler.all_affected_modules)
-        ]
-        return header + "\n" + "\n".join(lines)
+
+    def _add_changed() -> None:
+        if not changed_files:
+            return
+        num = len(changed_files)
+        lines.append(f"{prefix} {num} {_pluralize('file', num)} changed:")
+        plus = _green("+")
+        lines.extend(
+            f"{prefix}   {plus} {dim_open}{p}{dim_close}" for p in changed_files
+        )
+
+    tests = f"{num_tests} {_pluralize('test', num_tests)}"
+    files = f"{num_files} {_pluralize('file', num_files)}"
 
     if state.skip_enabled:
         duration = (
@@ -403,17 +662,12 @@ def pytest_report_collectionfinish(
             if estimated_duration
             else ""
         )
-        changed_section = (
-            (_format_changed() + "\n")
-            if state.verbose and handler.all_affected_modules
-            else ""
+        if state.verbose:
+            _add_changed()
+        lines.append(
+            f"{prefix} {_green('Skipped')} {tests} ({files}){duration} - unaffected by current changes."
         )
-        skipped_paths = _format_paths(handler.removed_test_paths, _green("-"))
-
-        output = f"""\
-{changed_section}\
-{prefix} {_green("Skipped")} {num_tests} {_pluralize("test", num_tests)} ({num_files} {_pluralize("file", num_files)}){duration} - unaffected by current changes.
-{skipped_paths}"""
+        _add_paths(removed_test_paths, _green("-"))
 
     else:
         duration = (
@@ -421,28 +675,23 @@ def pytest_report_collectionfinish(
             if estimated_duration
             else ""
         )
-        disable_hint = f"{prefix} {_dim('To disable: pytest -p no:tach (https://docs.gauge.sh/usage/commands#using-the-pytest-plugin-directly)')}"
+        lines.append(
+            f"{prefix} {tests} in {files} unaffected by changes{duration}. Skip with: {_bold('pytest --tach')}"
+        )
+        lines.append(
+            f"{prefix} {_dim('To disable: pytest -p no:tach (https://docs.gauge.sh/usage/commands#using-the-pytest-plugin-directly)')}"
+        )
 
         if state.verbose:
-            changed_section = (
-                (_format_changed() + "\n") if handler.all_affected_modules else ""
-            )
-            would_skip_paths = "\n".join(
-                f"{prefix}   {_yellow('?')} {_dim(str(p))}"
-                for p in handler.removed_test_paths
+            _add_changed()
+            lines.append(f"{prefix} Would skip:")
+            question = _yellow("?")
+            lines.extend(
+                f"{prefix}   {question} {dim_open}{p}{dim_close}"
+                for p in removed_test_paths
             )
-            output = f"""\
-{prefix} {num_tests} {_pluralize("test", num_tests)} in {num_files} {_pluralize("file", num_files)} unaffected by changes{duration}. Skip with: {_bold("pytest --tach")}
-{disable_hint}
-{changed_section}\
-{prefix} Would skip:
-{would_skip_paths}"""
-        else:
-            output = f"""\
-{prefix} {num_tests} {_pluralize("test", num_tests)} in {num_files} {_pluralize("file", num_files)} unaffected by changes{duration}. Skip with: {_bold("pytest --tach")}
-{disable_hint}"""
 
-    return output.strip().split("\n")
+    return lines
 
 
 def pytest_terminal_summary(
@@ -450,64 +699,73 @@ def pytest_terminal_summary(
     config: Config,
 ):
     # Check if plugin is active
-    if tach_state_key not in config.stash:
+    state = config.stash.get(tach_state_key, None)
+    if state is None:
         return
 
-    state = config.stash[tach_state_key]
     state.handler.tests_ran_to_completion = True
 
     # Only show validation results when skipping is NOT enabled
     # (i.e., when we ran all tests including would-be-skipped ones)
-    if not state.skip_enabled and state.would_skip_paths:
-        failed_reports: list[TestReport] = terminalreporter.stats.get("failed", [])
-        failed_would_skip: list[str] = []
-
-        # Resolve would-skip paths for comparison
-        resolved_would_skip = {p.resolve() for p in state.would_skip_paths}
-
-        for report in failed_reports:
-            # TestReport uses fspath for the file path
-            if hasattr(report, "fspath") and report.fspath:
-                report_path = Path(report.fspath).resolve()
-                if report_path in resolved_would_skip:
-                    failed_would_skip.append(report.nodeid)
-
-        if failed_would_skip:
-            terminalreporter.write_sep("=", "Tach Impact Analysis Warning")
-            terminalreporter.write_line(
-                f"[Tach] WARNING: {len(failed_would_skip)} test(s) failed that would be skipped by impact analysis!",
-                yellow=True,
-                bold=True,
-            )
-            terminalreporter.write_line(
-                "[Tach] These failures would be missed when using --tach:",
-                yellow=True,
-            )
-            for nodeid in failed_would_skip:
-                terminalreporter.write_line(f"[Tach]   - {nodeid}", yellow=True)
+    check_would_skip = not state.skip_enabled and bool(state.would_skip_paths)
+
+    # Single pass over the reports, collecting call-phase durations for future
+    # estimation alongside failures in files that --tach would have skipped
+    new_durations: dict[str, float] = {}
+    failed_would_skip: list[str] = []
+    for category in ("passed", "failed", "error"):
+        reports: list[TestReport] = terminalreporter.stats.get(category, [])
+        check_failures = check_would_skip and category == "failed"
+        for report in reports:
+            # Only record "call" phase duration (not setup/teardown). Collection
+            # errors are CollectReports without a `when`, hence the getattr.
+            if getattr(report, "when", None) == "call":
+                new_durations[report.nodeid] = report.duration
+            # would_skip_paths already holds resolved path strings
+            if (
+                check_failures
+                and _nodeid_file_path(config, report.nodeid) in state.would_skip_paths
+            ):
+                failed_would_skip.append(report.nodeid)
+
+    if failed_would_skip:
+        terminalreporter.write_sep("=", "Tach Impact Analysis Warning")
+        terminalreporter.write_line(
+            f"[Tach] WARNING: {len(failed_would_skip)} test(s) failed that would be skipped by impact analysis!",
+            yellow=True,
+            bold=True,
+        )
+        terminalreporter.write_line(
+            "[Tach] These failures would be missed when using --tach:",
+            yellow=True,
+        )
+        for nodeid in failed_would_skip:
+            terminalreporter.write_line(f"[Tach]   - {nodeid}", yellow=True)
 
     # Record test durations for future estimation
-    _record_test_durations(terminalreporter, config)
+    _record_test_durations(config, new_durations)
 
 
-def _record_test_durations(terminalreporter: TerminalReporter, config: Config) -> None:
-    """Record test durations to cache for future time estimation."""
-    # Get all test reports (passed, failed, etc.)
-    all_reports: list[TestReport] = []
-    for category in ["passed", "failed", "error"]:
-        all_reports.extend(terminalreporter.stats.get(category, []))
-
-    if not all_reports:
+def _record_test_durations(config: Config, new_durations: dict[str, float]) -> None:
+    """Merge newly measured {nodeid: duration} entries into the duration cache."""
+    if not new_durations:
+        # Nothing new to record, so avoid rewriting the cache file
+        return
+    if _get_pytest_cache(config) is None:
+        # Cache disabled (e.g. -p no:cacheprovider): nowhere to persist them
         return
 
-    # Get existing durations and update with new ones
+    # Get existing durations and update with new ones. Files are kept in
+    # least-recently-recorded order: refreshed files move to the end, so
+    # trimming from the front drops files that haven't run in the longest time.
     durations = _get_cached_durations(config)
+    for file_part, file_durations in _group_durations_by_file(new_durations).items():
+        updated = durations.pop(file_part, {})
+        updated.update(file_durations)
+        durations[file_part] = updated
 
-    for report in all_reports:
-        # Only record "call" phase duration (not setup/teardown)
-        if hasattr(report, "when") and report.when == "call":
-            if hasattr(report, "nodeid") and hasattr(report, "duration"):
-                durations[report.nodeid] = report.duration
+    if len(durations) > TACH_DURATIONS_MAX_FILES:
+        durations = dict(list(durations.items())[-TACH_DURATIONS_MAX_FILES:])
 
     # Save updated durations
     _save_durations(config, durations)
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import gzip
+import io
 import json
-from dataclasses import asdict, dataclass, field
+import re
+from dataclasses import dataclass, field, fields, is_dataclass
 from json.decoder import JSONDecodeError
 from typing import TYPE_CHECKING
 from urllib import error, request
@@ -18,11 +21,17 @@ from tach.modularity import (
 if TYPE_CHECKING:
     from pathlib import Path
 
-    import pydot  # type: ignore
-
     from tach.extension import ProjectConfig
 
 
+def _dataclass_to_dict(o: object) -> dict[str, object]:
+    # Used as the JSON encoder's fallback so nested dataclasses are serialized
+    # field by field, without the deep copy that dataclasses.asdict makes.
+    if is_dataclass(o) and not isinstance(o, type):
+        return {f.name: getattr(o, f.name) for f in fields(o)}
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
 @dataclass
 class ShowReportMetadata:
     version: str = "1.5"
@@ -66,12 +75,16 @@ def upload_show_report(
         project_config=project_config,
         included_paths=included_paths,
     )
-    json_data = json.dumps(asdict(show_report))
-    json_bytes = json_data.encode("utf-8")
+    # Compress as we encode so the full JSON string is never held in memory
+    encoder = json.JSONEncoder(default=_dataclass_to_dict)
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=6) as gz:
+        for chunk in encoder.iterencode(show_report):
+            _ = gz.write(chunk.encode("utf-8"))
     req = request.Request(
         f"{GAUGE_API_BASE_URL}/api/show/graph/1.5",
-        data=json_bytes,
-        headers={"Content-Type": "application/json"},
+        data=buffer.getvalue(),
+        headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
     )
     try:
         # Send the request and read the response
@@ -85,38 +98,48 @@ def upload_show_report(
         return None
 
 
+_DOT_KEYWORDS = frozenset(("strict", "graph", "digraph", "subgraph", "node", "edge"))
+_DOT_BARE_ID = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+def _dot_id(name: str) -> str:
+    # Bare alphanumeric IDs and '<...>' (e.g. '<root>') are written as-is,
+    # matching what pydot produced; everything else is quoted and escaped.
+    if name.startswith("<") and name.endswith(">"):
+        return name
+    if _DOT_BARE_ID.fullmatch(name) and name.lower() not in _DOT_KEYWORDS:
+        return name
+    escaped = name.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
 def generate_module_graph_dot_string(
     project_config: ProjectConfig,
     included_paths: list[Path],
 ) -> str:
-    # Local import because networkx takes about ~100ms to load
-    import networkx as nx
-
-    graph = nx.DiGraph()  # type: ignore
-
-    def upsert_edge(
-        graph: nx.DiGraph,  # type: ignore
-        module: str,
-        dependency: str,
-        dashed: bool = False,
-    ) -> None:
-        if module not in graph:
-            graph.add_node(module)  # type: ignore
-        if dependency not in graph:
-            graph.add_node(dependency)  # type: ignore
-        if dashed:
-            _ = graph.add_edge(module, dependency, style="dashed")  # type: ignore
-        else:
-            _ = graph.add_edge(module, dependency)  # type: ignore
-
     modules = project_config.filtered_modules(included_paths)
-
+    # Adjacency in insertion order, mirroring networkx: nodes appear in order of
+    # first use, and edges are grouped by their source node. Repeated edges
+    # collapse (as in a strict digraph) and are dashed if any of them was.
+    adjacency: dict[str, dict[str, bool]] = {}
     for module in modules:
         for dependency in module.depends_on or []:
-            upsert_edge(graph, module.path, dependency.path, dependency.deprecated)  # type: ignore
-
-    pydot_graph: pydot.Dot = nx.nx_pydot.to_pydot(graph)  # type: ignore
-    return str(pydot_graph.to_string())  # type: ignore
+            targets = adjacency.setdefault(module.path, {})
+            _ = adjacency.setdefault(dependency.path, {})
+            targets[dependency.path] = (
+                targets.get(dependency.path, False) or dependency.deprecated
+            )
+
+    lines = ["strict digraph {"]
+    lines.extend(f"{_dot_id(node)};" for node in adjacency)
+    for module_path, targets in adjacency.items():
+        for dependency_path, dashed in targets.items():
+            style = " [style=dashed]" if dashed else ""
+            lines.append(
+                f"{_dot_id(module_path)} -> {_dot_id(dependency_path)}{style};"
+            )
+    lines.append("}\n")
+    return "\n".join(lines)
 
 
 def generate_module_graph_mermaid_string(
@@ -129,17 +152,15 @@ def generate_module_graph_mermaid_string(
     LINE_ARROW = "-->"
     DOTTED_ARROW = "-.->"
     for module in modules:
-        for dependency in module.depends_on or []:
-            module_name = module.path.strip("<>")
-            dependency_name = dependency.path.strip("<>")
-            if dependency.deprecated:
-                edges.append(f"    {module_name} {DOTTED_ARROW} {dependency_name}")
-            else:
-                edges.append(f"    {module_name} {LINE_ARROW} {dependency_name}")
+        module_name = module.path.strip("<>")
         if not module.depends_on:
-            isolated.append(f"    {module.path.strip('<>')}")
+            isolated.append(f"    {module_name}")
+            continue
+        for dependency in module.depends_on:
+            arrow = DOTTED_ARROW if dependency.deprecated else LINE_ARROW
+            edges.append(f"    {module_name} {arrow} {dependency.path.strip('<>')}")
 
-    return "graph TD\n" + "\n".join(edges) + "\n" + "\n".join(isolated)
+    return "\n".join(("graph TD", "\n".join(edges), "\n".join(isolated)))
 
 
 def generate_module_graph_dot_file(
@@ -1,20 +1,30 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import pytest
 
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+
+EXAMPLE_DIR = Path(__file__).parent / "example"
+
 
 @pytest.fixture
 def example_dir() -> Path:
-    current_dir = Path(__file__).parent
-    return current_dir / "example"
+    return EXAMPLE_DIR
 
 
-@pytest.fixture(autouse=True, scope="function")
-def no_color(monkeypatch: pytest.MonkeyPatch) -> None:
+@pytest.fixture(autouse=True, scope="session")
+def no_color() -> Generator[None, None, None]:
     # According to https://bixense.com/clicolors/, NO_COLOR=1 should be enough.
     # "console", however, does not respect "NO_COLOR" as of this writing,
     # and requires CLICOLOR_FORCE being unset.
-    monkeypatch.setenv("NO_COLOR", "1")
-    monkeypatch.delenv("CLICOLOR_FORCE", raising=False)
+    # The built-in monkeypatch fixture is function-scoped, so use a MonkeyPatch
+    # directly to set this up once for the whole session.
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("NO_COLOR", "1")
+        monkeypatch.delenv("CLICOLOR_FORCE", raising=False)
+        yield
@@ -1,7 +1,23 @@
 from __future__ import annotations
 
+import base64
+import json
+import os
+import shutil
+import subprocess
+import zlib
+from typing import TYPE_CHECKING
+
 import pytest
 
+# Importing the plugin (and with it the compiled extension) before any pytester
+# run puts them in the sys.modules snapshot that in-process runs restore, so the
+# extension is never initialized a second time.
+from tach import pytest_plugin
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
 pytest_plugins = ["pytester"]
 
 
@@ -10,20 +26,16 @@ def makepyfile(pytester: pytest.Pytester, *args: str | bytes, **kwargs: str | by
     _ = pytester.makepyfile(*args, **kwargs)  # pyright: ignore[reportUnknownMemberType]
 
 
-@pytest.fixture
-def tach_project(pytester: pytest.Pytester):
-    """Create a basic tach project structure."""
-    _ = pytester.makefile(".toml", tach='source_roots = ["."]')
-    makepyfile(
-        pytester,
-        src_module="""
+_TACH_PROJECT_FILES = {
+    "tach.toml": 'source_roots = ["."]\n',
+    "src_module.py": """\
 def add(a, b):
     return a + b
 
 def subtract(a, b):
     return a - b
 """,
-        test_with_import="""
+    "test_with_import.py": """\
 from src_module import add
 
 def test_add_basic():
@@ -35,29 +47,65 @@ def test_add_zero():
 def test_add_negative():
     assert add(-1, 1) == 0
 """,
-        test_no_import="""
+    "test_no_import.py": """\
 def test_standalone_1():
     assert True
 
 def test_standalone_2():
     assert 1 + 1 == 2
 """,
-    )
-    # Initialize git repo
-    _ = pytester.run("git", "init")
-    _ = pytester.run("git", "config", "user.email", "test@test.com")
-    _ = pytester.run("git", "config", "user.name", "Test")
-    _ = pytester.run("git", "add", "-A")
-    _ = pytester.run("git", "commit", "-m", "initial")
+}
+
+
+@pytest.fixture(scope="module")
+def tach_project_template(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Build the basic tach project and its git repo once per module.
+
+    Tests never touch this directory; `tach_project` copies it instead.
+    """
+    root = tmp_path_factory.mktemp("tach_project")
+    for name, content in _TACH_PROJECT_FILES.items():
+        _ = (root / name).write_text(content)
+    # Like pytester, keep the developer's global and system git config (hooks,
+    # commit signing, ...) out of the template repo
+    home = tmp_path_factory.mktemp("home")
+    env = {
+        **os.environ,
+        "HOME": str(home),
+        "USERPROFILE": str(home),
+        "GIT_CONFIG_NOSYSTEM": "1",
+    }
+    _ = env.pop("GIT_CONFIG_GLOBAL", None)
+    for args in (
+        ("init", "-q", "--initial-branch=main"),
+        ("config", "user.email", "test@test.com"),
+        ("config", "user.name", "Test"),
+        ("add", "-A"),
+        ("commit", "-q", "-m", "initial"),
+    ):
+        _ = subprocess.run(
+            ["git", *args], cwd=root, env=env, check=True, capture_output=True
+        )
+    return root
+
+
+@pytest.fixture
+def tach_project(pytester: pytest.Pytester, tach_project_template: Path):
+    """Create a basic tach project structure, with one initial git commit."""
+    _ = shutil.copytree(tach_project_template, pytester.path, dirs_exist_ok=True)
     return pytester
 
 
 def run_pytest(pytester: pytest.Pytester, *args: str) -> pytest.RunResult:
-    """Run pytest in subprocess to avoid PyO3 reinitialization issues.
+    """Run pytest in-process, avoiding a new interpreter per run.
 
-    The tach plugin is auto-loaded via pytest11 entrypoint.
+    The tach plugin is auto-loaded via pytest11 entrypoint. It is imported once
+    at module level, because PyO3 modules can't be reinitialized within a
+    process. The plugin's module-level caches are reset so that each run starts
+    out like a fresh process (e.g. styling picks up the current NO_COLOR setting).
     """
-    return pytester.runpytest_subprocess(*args)
+    pytest_plugin._reset_caches()  # pyright: ignore[reportPrivateUsage]
+    return pytester.runpytest(*args)
 
 
 class TestPytestPluginSkipping:
@@ -83,8 +131,7 @@ def subtract(a, b):
 # Modified
 """,
         )
-        _ = tach_project.run("git", "add", "src_module.py")
-        _ = tach_project.run("git", "commit", "-m", "modify source")
+        _ = tach_project.run("git", "commit", "-q", "-am", "modify source")
 
         result = run_pytest(tach_project, "--tach-base", "HEAD~1")
         result.assert_outcomes(passed=3)
@@ -111,12 +158,13 @@ def test_standalone_3():
     assert "new test"
 """,
         )
-        _ = tach_project.run("git", "add", "test_no_import.py")
-        _ = tach_project.run("git", "commit", "-m", "add test")
+        _ = tach_project.run("git", "commit", "-q", "-am", "add test")
 
         result = run_pytest(tach_project, "--tach-base", "HEAD~1")
-        result.assert_outcomes(passed=3)
-        result.stdout.fnmatch_lines(["*Skipped 3 test* (1 file*"])
+        # The changed file runs, and so does test_with_import, since the change
+        # touches the root module it imports from
+        result.assert_outcomes(passed=6)
+        result.stdout.no_fnmatch_line("*Skipped*")
 
 
 class TestPytestPluginDefaults:
@@ -136,6 +184,39 @@ class TestPytestPluginDefaults:
         result.assert_outcomes(passed=0)
         result.stdout.fnmatch_lines(["*Skipped 5 test* (2 file*"])
 
+    def test_default_branch_env_override(
+        self, tach_project: pytest.Pytester, monkeypatch: pytest.MonkeyPatch
+    ):
+        """TACH_DEFAULT_BRANCH should be used as the base instead of auto-detection."""
+        monkeypatch.setenv("TACH_DEFAULT_BRANCH", "does-not-exist")
+        result = run_pytest(tach_project, "--tach")
+        assert result.ret == pytest.ExitCode.USAGE_ERROR
+        result.stderr.fnmatch_lines(["*base='does-not-exist'*"])
+
+    def test_default_branch_env_override_is_not_cached(
+        self, tach_project: pytest.Pytester, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Changing TACH_DEFAULT_BRANCH between runs in one process takes effect."""
+        result = run_pytest(tach_project, "--tach")
+        result.assert_outcomes(passed=0)
+
+        monkeypatch.setenv("TACH_DEFAULT_BRANCH", "does-not-exist")
+        # Deliberately keep the plugin's caches from the first run
+        result = tach_project.runpytest("--tach")
+        assert result.ret == pytest.ExitCode.USAGE_ERROR
+        result.stderr.fnmatch_lines(["*base='does-not-exist'*"])
+
+    def test_default_branch_from_origin_head(self, tach_project: pytest.Pytester):
+        """The remote default branch should be read from origin/HEAD when set."""
+        origin_head = (
+            tach_project.path / ".git" / "refs" / "remotes" / "origin" / "HEAD"
+        )
+        origin_head.parent.mkdir(parents=True)
+        _ = origin_head.write_text("ref: refs/remotes/origin/does-not-exist\n")
+        result = run_pytest(tach_project, "--tach")
+        assert result.ret == pytest.ExitCode.USAGE_ERROR
+        result.stderr.fnmatch_lines(["*base='does-not-exist'*"])
+
     def test_disable_plugin_with_p_flag(self, tach_project: pytest.Pytester):
         """-p no:tach should disable the plugin entirely."""
         result = run_pytest(tach_project, "-p", "no:tach")
@@ -144,6 +225,33 @@ class TestPytestPluginDefaults:
         # Should NOT show any tach output
         assert "[Tach]" not in result.stdout.str()
 
+    def test_no_tach_config_disables_plugin(self, tach_project: pytest.Pytester):
+        """Without a tach config, the plugin should stay out of the way."""
+        (tach_project.path / "tach.toml").unlink()
+        result = run_pytest(tach_project, "--tach")
+        result.assert_outcomes(passed=5)
+        assert "[Tach]" not in result.stdout.str()
+
+    def test_warns_when_would_skip_test_fails(self, tach_project: pytest.Pytester):
+        """Failures in tests that --tach would skip should be called out."""
+        makepyfile(
+            tach_project,
+            test_no_import="""
+def test_standalone_1():
+    assert False
+""",
+        )
+        _ = tach_project.run("git", "commit", "-q", "-am", "break test")
+
+        result = run_pytest(tach_project)
+        result.assert_outcomes(failed=1, passed=3)
+        result.stdout.fnmatch_lines(
+            [
+                "*1 test(s) failed that would be skipped*",
+                "*test_no_import.py::test_standalone_1",
+            ]
+        )
+
     def test_verbose_mode_shows_details(self, tach_project: pytest.Pytester):
         """--tach-verbose should show changed files and would-skip paths."""
         result = run_pytest(tach_project, "--tach-verbose")
@@ -174,7 +282,7 @@ def test_regular():
 """,
         )
         _ = tach_project.run("git", "add", "test_parametrized.py")
-        _ = tach_project.run("git", "commit", "--amend", "--no-edit")
+        _ = tach_project.run("git", "commit", "-q", "--amend", "--no-edit")
 
         result = run_pytest(tach_project, "--tach-base", "HEAD")
         result.assert_outcomes(passed=0)
@@ -199,7 +307,7 @@ class TestAnotherGroup:
 """,
         )
         _ = tach_project.run("git", "add", "test_class.py")
-        _ = tach_project.run("git", "commit", "--amend", "--no-edit")
+        _ = tach_project.run("git", "commit", "-q", "--amend", "--no-edit")
 
         result = run_pytest(tach_project, "--tach-base", "HEAD")
         result.assert_outcomes(passed=0)
@@ -221,3 +329,64 @@ class TestPytestPluginDurations:
         result2.assert_outcomes(passed=0)
         # Should show estimated duration (format: ~X.Xs saved)
         result2.stdout.fnmatch_lines(["*~*s saved*"])
+
+    def test_estimate_survives_moving_the_checkout(
+        self,
+        tach_project: pytest.Pytester,
+        tmp_path_factory: pytest.TempPathFactory,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Cached durations should still apply after the project directory moves."""
+        result1 = run_pytest(tach_project)
+        result1.assert_outcomes(passed=5)
+
+        moved = tmp_path_factory.mktemp("moved") / "project"
+        _ = shutil.copytree(tach_project.path, moved)
+        monkeypatch.chdir(moved)
+
+        result2 = run_pytest(tach_project, "--tach-base", "HEAD")
+        result2.assert_outcomes(passed=0)
+        result2.stdout.fnmatch_lines(["*~*s saved*"])
+
+    def test_works_with_cache_disabled(self, tach_project: pytest.Pytester):
+        """Without the cacheprovider plugin, tests still run and no estimate is shown."""
+        result1 = run_pytest(tach_project, "-p", "no:cacheprovider")
+        result1.assert_outcomes(passed=5)
+
+        result2 = run_pytest(
+            tach_project, "-p", "no:cacheprovider", "--tach-base", "HEAD"
+        )
+        result2.assert_outcomes(passed=0)
+        result2.stdout.no_fnmatch_line("*saved*")
+        assert not (tach_project.path / ".pytest_cache").exists()
+
+    def test_reads_legacy_flat_duration_cache(self, tach_project: pytest.Pytester):
+        """Durations cached in the old flat {nodeid: duration} format should still be used."""
+        cache_file = tach_project.path / ".pytest_cache" / "v" / "tach" / "durations"
+        cache_file.parent.mkdir(parents=True)
+        _ = cache_file.write_text(
+            json.dumps(
+                {
+                    "test_no_import.py::test_standalone_1": 4.0,
+                    "test_no_import.py::test_standalone_2": 1.5,
+                }
+            )
+        )
+
+        result = run_pytest(tach_project, "--tach-base", "HEAD")
+        result.assert_outcomes(passed=0)
+        result.stdout.fnmatch_lines(["*~5.5s saved*"])
+
+    def test_ignores_malformed_duration_cache(self, tach_project: pytest.Pytester):
+        """A cache payload that decodes but has the wrong shape is treated as empty."""
+        columns = {"paths": ["test_no_import.py"], "durations": [[2.0, 1.5]]}
+        blob = zlib.compress(json.dumps(columns).encode())
+        cache_file = tach_project.path / ".pytest_cache" / "v" / "tach" / "durations"
+        cache_file.parent.mkdir(parents=True)
+        _ = cache_file.write_text(
+            json.dumps({"version": 2, "data": base64.b64encode(blob).decode()})
+        )
+
+        result = run_pytest(tach_project, "--tach-base", "HEAD")
+        result.assert_outcomes(passed=0)
+        result.stdout.no_fnmatch_line("*saved*")
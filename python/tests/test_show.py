@@ -1,7 +1,37 @@
 from __future__ import annotations
 
+import gzip
+import io
+import json
+from functools import cache
+from typing import TYPE_CHECKING, cast
+
+import pytest
+
 from tach.parsing.config import parse_project_config
-from tach.show import generate_show_report
+from tach.show import (
+    _dot_id,  # pyright: ignore[reportPrivateUsage]
+    generate_module_graph_dot_string,
+    generate_module_graph_mermaid_string,
+    generate_show_report,
+    upload_show_report,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from urllib import request
+
+    from pytest_mock import MockerFixture
+
+    from tach.extension import ProjectConfig
+
+
+@cache
+def _cached_parse_project_config(project_root: Path) -> ProjectConfig:
+    """Parse an example project's config once, for tests that only read it."""
+    project_config = parse_project_config(root=project_root)
+    assert project_config is not None
+    return project_config
 
 
 # right now this is just a smoke test
@@ -15,3 +45,72 @@ def test_many_features_example_dir(example_dir, capfd):
         project_root=project_root, project_config=project_config, included_paths=[]
     )
     assert report is not None
+
+
+def test_valid_example_mermaid_output(example_dir: Path):
+    project_config = _cached_parse_project_config(example_dir / "valid")
+
+    assert generate_module_graph_mermaid_string(project_config, []) == (
+        "graph TD\n"
+        "    domain_one -.-> domain_two\n"
+        "    domain_two --> domain_three\n"
+        "    root --> domain_one\n"
+        "    domain_three"
+    )
+
+
+def test_valid_example_dot_output(example_dir: Path):
+    project_config = _cached_parse_project_config(example_dir / "valid")
+
+    assert generate_module_graph_dot_string(project_config, []) == (
+        "strict digraph {\n"
+        "domain_one;\n"
+        "domain_two;\n"
+        "domain_three;\n"
+        "<root>;\n"
+        "domain_one -> domain_two [style=dashed];\n"
+        "domain_two -> domain_three;\n"
+        "<root> -> domain_one;\n"
+        "}\n"
+    )
+
+
+@pytest.mark.parametrize(
+    "name,expected",
+    [
+        ("domain_one", "domain_one"),
+        ("<root>", "<root>"),
+        ("a.b.c", '"a.b.c"'),
+        ("globbed.**", '"globbed.**"'),
+        ("node", '"node"'),
+        ("1abc", '"1abc"'),
+        ('we"ird', '"we\\"ird"'),
+    ],
+)
+def test_dot_id_quoting(name: str, expected: str):
+    assert _dot_id(name) == expected
+
+
+def test_upload_show_report_sends_gzipped_json(
+    example_dir: Path, mocker: MockerFixture
+):
+    project_root = example_dir / "valid"
+    project_config = _cached_parse_project_config(project_root)
+
+    urlopen = mocker.patch(
+        "tach.show.request.urlopen", return_value=io.BytesIO(b'{"uid": "abc"}')
+    )
+
+    url = upload_show_report(
+        project_root=project_root, project_config=project_config, included_paths=[]
+    )
+
+    assert url is not None and url.endswith("/show?uid=abc")
+    req = cast("request.Request", urlopen.call_args.args[0])
+    assert req.get_header("Content-encoding") == "gzip"
+    payload = cast(
+        "dict[str, object]", json.loads(gzip.decompress(cast("bytes", req.data)))
+    )
+    assert payload["metadata"] == {"version": "1.5"}
+    modules = cast("list[dict[str, object]]", payload["modules"])
+    assert {module["path"] for module in modules} >= {"domain_one"}